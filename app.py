@@ -3,9 +3,6 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-import seaborn as sns
-import matplotlib.pyplot as plt
-from io import BytesIO
 
 st.set_page_config(page_title="HR Attrition Dashboard", layout="wide", page_icon="📊")
 
@@ -23,45 +20,187 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- LOAD DATA ---
-df = pd.read_csv('united.csv')
-# Map the Attrition column from Yes/No to 1/0 for easier calculations
-df["Attrition"] = df["Attrition"].map({'Yes': 1, 'No': 0})
-df["OverTime"] = df["OverTime"].map({'Yes': True, 'No': False})
-
-# Pre‑calculate tenure groupings used throughout the dashboard.  The "YearsAtCompanyGroup"
-# column divides employees into meaningful tenure bins (0–2, 2–5, 5–10, 10+ years).
-tenure_bins = [0, 2, 5, 10, float('inf')]
-tenure_labels = ["0–2 years", "2–5 years", "5–10 years", "10+ years"]
-df["YearsAtCompanyGroup"] = pd.cut(
-    df["YearsAtCompany"],
-    bins=tenure_bins,
-    labels=tenure_labels,
-    right=False,
-    include_lowest=True
-)
+@st.cache_data(show_spinner=False)
+def load_data(path):
+    """Read the employee CSV and apply all column preprocessing once per file.
+
+    Streamlit reruns the whole script on every widget interaction, so caching keeps the
+    disk read, the Yes/No mappings and the tenure binning out of those reruns.  Callers
+    should treat the returned frame as read-only and filter into new frames instead.
+
+    Returns the frame and a content hash of it.  The hash is the cache key that ties the
+    aggregation helpers below to this exact frame.
+    """
+    # The binning and dtype settings live here, not at module level, because
+    # st.cache_data keys on this function's source.  Editing them then reloads the data.
+    # Small-range integer columns read straight into narrow dtypes instead of int64.
+    numeric_dtypes = {"Age": "int8", "DistanceFromHome": "int8", "JobLevel": "int8", "YearsAtCompany": "int8"}
+    # Low-cardinality text columns stored as pandas categoricals so filters and groupbys
+    # work on small integer codes rather than Python strings.
+    categorical_columns = ["Department", "JobRole", "Gender", "MaritalStatus", "EducationField", "BusinessTravel"]
+    # Tenure groupings used throughout the dashboard (0–2, 2–5, 5–10, 10+ years).
+    tenure_bins = [0, 2, 5, 10, np.inf]
+    tenure_labels = ["0–2 years", "2–5 years", "5–10 years", "10+ years"]
+
+    # The pyarrow engine parses the file multi-threaded (pyarrow ships with Streamlit).
+    df = pd.read_csv(path, engine="pyarrow", dtype=numeric_dtypes)
+    # Map the Attrition column from Yes/No to 1/0 for easier calculations
+    df["Attrition"] = (df["Attrition"] == "Yes").astype("int8")
+    df["OverTime"] = df["OverTime"].eq("Yes")
+    for col in categorical_columns:
+        df[col] = df[col].astype("category")
+    df["YearsAtCompanyGroup"] = pd.cut(
+        df["YearsAtCompany"],
+        bins=tenure_bins,
+        labels=tenure_labels,
+        right=False,
+        include_lowest=True
+    )
+    # Commute distance in 7-unit ranges, with edges taken from the full data set so every
+    # department filter shares the same ranges.  Bins are right-closed ((lo, hi], with the
+    # first also including lo), so each label names the values its bin actually holds.
+    min_dist = int(df["DistanceFromHome"].min())
+    max_dist = int(df["DistanceFromHome"].max())
+    bin_edges = list(range(min_dist, max_dist + 7, 7))
+    range_labels = [
+        f"{lo if i == 0 else lo + 1}–{hi}" for i, (lo, hi) in enumerate(zip(bin_edges[:-1], bin_edges[1:]))
+    ]
+    df["DistanceFromHomeRange"] = pd.cut(
+        df["DistanceFromHome"],
+        bins=bin_edges,
+        labels=range_labels,
+        include_lowest=True,
+        ordered=True
+    )
+    data_version = int(pd.util.hash_pandas_object(df, index=False).sum())
+    return df, data_version
+
+
+df, data_version = load_data('united.csv')
+tenure_labels = df["YearsAtCompanyGroup"].cat.categories.tolist()
+# Filter options shared by the chart selectboxes, derived once from the loaded frame.
+departments = ['All'] + df['Department'].cat.categories.tolist()
+joblevel_options = ['All'] + [str(jl) for jl in sorted(df['JobLevel'].unique())]
+
+
+# --- CACHED AGGREGATIONS ---
+# Each chart's aggregation is memoised on its filter value, so a rerun where that chart's
+# filter did not change is a cache lookup instead of a fresh groupby.  The frame is passed
+# as ``_df``, which Streamlit does not hash; ``data_version`` from ``load_data`` is the
+# part of the key that changes whenever the frame does.
+# Filtered branches select only the columns the aggregation reads, so the row mask does
+# not copy every column of the frame.
+@st.cache_data(show_spinner=False)
+def rate_by(_df, data_version, key, filter_col=None, filter_val=None):
+    """Attrition rate (%) per value of ``key``, optionally restricted to ``filter_col == filter_val``.
+
+    The single-key rate charts all share this primitive; ``filter_val`` of None or 'All'
+    means no filter.
+    """
+    if filter_val is None or filter_val == 'All':
+        sub = _df
+    else:
+        sub = _df.loc[_df[filter_col] == filter_val, [key, "Attrition"]]
+    # "Attrition" is 0/1, so the group mean is the share who left.
+    return sub.groupby(key, observed=True)["Attrition"].mean().mul(100)
+
+
+@st.cache_data(show_spinner=False)
+def jobrole_attrition(_df, data_version):
+    """Headcount and attrition per job role across all departments, sorted by attrition rate."""
+    # "Attrition" is 0/1, so the built-in mean is the share who left; named reductions
+    # stay on pandas' vectorised path instead of calling a Python lambda per group.
+    jobrole_attr = _df.groupby("JobRole", observed=True)["Attrition"].agg(count_JobRole="count", attrition_left="mean")
+    jobrole_attr["attrition_left"] = jobrole_attr["attrition_left"] * 100
+    jobrole_attr["attrition_stay"] = 100 - jobrole_attr["attrition_left"]
+    return jobrole_attr.sort_values("attrition_left", ascending=False)
+
+
+@st.cache_data(show_spinner=False)
+def distance_jobrole_summary(_df, data_version, dept):
+    """Attrition % per commute-distance range and job role (cells with > 7 employees)."""
+    sub = _df if dept == 'All' else _df.loc[_df['Department'] == dept, ["DistanceFromHomeRange", "JobRole", "Attrition"]]
+    # "DistanceFromHomeRange" is binned once in load_data; observed=True skips the empty
+    # range × role combinations instead of building the full Cartesian product.
+    summary = (
+        sub.groupby(["DistanceFromHomeRange", "JobRole"], observed=True)["Attrition"]
+        .agg(count="count", attrition_left="mean")
+        .reset_index()
+    )
+    summary["attrition_left"] = summary["attrition_left"] * 100
+    return summary[summary["count"] > 7]
+
+
+# Left/Stayed frames for the stacked charts.  These are plain wrappers around the cached
+# rate_by, so each chart goes through a single cache layer.
+def overtime_summary(df, data_version, ot):
+    """Left/Stayed percentages per overtime participation for 'Yes', 'No' or 'All'."""
+    left = rate_by(df, data_version, "OverTime", "OverTime", None if ot == 'All' else ot == 'Yes')
+    overtime_labels = {True: "Did Overtime", False: "Did Not Do Overtime"}
+    return pd.DataFrame({"Left": left, "Stayed": 100 - left}).rename(index=overtime_labels)
+
+
+def joblevel_summary(df, data_version, lvl):
+    """Stayed/Left percentages per job level for one level (as a string) or 'All'."""
+    left = rate_by(df, data_version, "JobLevel", "JobLevel", None if lvl == 'All' else int(lvl))
+    return pd.DataFrame({"Stayed": 100 - left, "Left": left})
+
+
+def tenure_summary(df, data_version, tg):
+    """Stayed/Left percentages per tenure group for one group label or 'All'."""
+    left = rate_by(df, data_version, "YearsAtCompanyGroup", "YearsAtCompanyGroup", tg)
+    return pd.DataFrame({"Stayed": 100 - left, "Left": left})
+
+
+@st.cache_data(show_spinner=False)
+def joblevel_tenure_pivot(_df, data_version):
+    """Attrition rate (%) with job levels as rows and tenure groups as columns."""
+    # Map each row with a tenure group to a flat (level, tenure) cell code.  Two
+    # np.bincount calls over those codes then give the employee count and the number who
+    # left in each cell.  "Attrition" is 0/1, so left / count is the rate; empty cells stay NaN.
+    level_codes, levels = pd.factorize(_df["JobLevel"], sort=True)
+    tenure = _df["YearsAtCompanyGroup"].cat
+    tenure_codes = tenure.codes.to_numpy()
+    valid = tenure_codes >= 0
+    n_levels, n_tenures = len(levels), len(tenure.categories)
+    cells = level_codes[valid] * n_tenures + tenure_codes[valid]
+    counts = np.bincount(cells, minlength=n_levels * n_tenures)
+    left = np.bincount(cells, weights=_df["Attrition"].to_numpy()[valid], minlength=n_levels * n_tenures)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rates = np.where(counts > 0, 100 * left / counts, np.nan)
+    return pd.DataFrame(
+        rates.reshape(n_levels, n_tenures),
+        index=pd.Index(levels, name="JobLevel"),
+        columns=pd.CategoricalIndex(
+            tenure.categories, categories=tenure.categories, ordered=tenure.ordered, name="YearsAtCompanyGroup"
+        )
+    )
+
+
+@st.cache_data(show_spinner=False)
+def compute_kpis(_df, data_version):
+    """Overall, entry-level and 0–2yr attrition rates (%) via vectorised NumPy reductions."""
+    attrition = _df["Attrition"].to_numpy()
+    level1 = _df["JobLevel"].to_numpy() == 1
+    early_tenure = _df["YearsAtCompany"].to_numpy() <= 2
+    overall_rate = attrition.mean() * 100
+    level1_rate = attrition[level1].mean() * 100 if level1.any() else 0
+    early_tenure_rate = attrition[early_tenure].mean() * 100 if early_tenure.any() else 0
+    return overall_rate, level1_rate, early_tenure_rate
+
 
 # --- KPI SECTION ---
 st.title("HR Attrition Analysis Dashboard")
 kpi1, kpi2, kpi3, kpi4 = st.columns(4)
+overall_attrition_rate, level1_rate, early_tenure_rate = compute_kpis(df, data_version)
 # KPI 1: Overall Attrition Rate
-overall_attrition_rate = df["Attrition"].mean() * 100
 kpi1.metric("Overall Attrition Rate", f"{overall_attrition_rate:.1f}%")
 # KPI 2: Entry-Level Attrition
-level1 = df[df["JobLevel"] == 1]
-level1_rate = level1["Attrition"].mean() * 100 if not level1.empty else 0
 kpi2.metric("Entry-Level Attrition", f"{level1_rate:.1f}%")
 # KPI 3: Early Tenure Attrition
-early_tenure = df[df["YearsAtCompany"] <= 2]
-early_tenure_rate = early_tenure["Attrition"].mean() * 100 if not early_tenure.empty else 0
 kpi3.metric("0–2yr Attrition", f"{early_tenure_rate:.1f}%")
 # KPI 4: Highest Risk Role
-jobrole_attr = (
-    df.groupby("JobRole")
-    .agg(count_JobRole=("JobRole", "count"),
-         attrition_left=("Attrition", lambda x: 100 * (x == 1).sum() / len(x)),
-         attrition_stay=("Attrition", lambda x: 100 * (x == 0).sum() / len(x)))
-    .sort_values(["attrition_left"], ascending=False)
-)
+jobrole_attr = jobrole_attrition(df, data_version)
 if not jobrole_attr.empty:
     top_role = jobrole_attr.index[0]
     top_role_val = jobrole_attr.iloc[0]["attrition_left"]
@@ -74,156 +213,129 @@ st.subheader("Attrition by Job Role (Table)")
 st.dataframe(jobrole_attr, use_container_width=False)
 
 # --- CHART: Attrition Rate by Job Role ---
-st.subheader("Attrition Rate by Job Role")
-col1, col2 = st.columns([2,1])
-with col1:
-    # Filters
-    departments = ['All'] + sorted(df['Department'].dropna().unique())
-    selected_dept = st.selectbox("Filter by Department", departments, key='dept_chart_1')
-    filtered_df = df.copy()
-    if selected_dept != 'All':
-        filtered_df = filtered_df[filtered_df['Department'] == selected_dept]
-    # Recreate jobrole_attr for filtered data
-    jobrole_attr_filtered = (
-        filtered_df.groupby("JobRole")
-        .agg(count_JobRole=("JobRole", "count"),
-             attrition_left=("Attrition", lambda x: 100 * (x == 1).sum() / len(x)),
-             attrition_stay=("Attrition", lambda x: 100 * (x == 0).sum() / len(x)))
-        .sort_values(["attrition_left"], ascending=False)
-    )
-    if not jobrole_attr_filtered.empty:
-        fig = px.bar(jobrole_attr_filtered.reset_index(),
-                     x="JobRole", y="attrition_left",
-                     color_discrete_sequence=["#1976D2"]*len(jobrole_attr_filtered),  # United color
-                     )
-        fig.update_traces(marker_line_color='black', marker_line_width=1)
-        fig.update_layout(width=500, height=350, margin=dict(l=20, r=20, t=40, b=20),
-                          xaxis_title="Job Role", yaxis_title="Attrition Rate (%)",
-                          title="Attrition Rate by Job Role")
-        fig.update_xaxes(tickangle=30)
-        st.plotly_chart(fig)
-    else:
-        st.info("No data for selected filter.")
-with col2:
-    st.markdown("**Insight:** Sales Representatives have the highest attrition rate (~40%), suggesting potential issues in role satisfaction or workload. Roles with lower attrition may have better retention practices or job satisfaction.")
+# Each chart with its own filter is a fragment, so changing that filter reruns only the
+# chart's function instead of the whole script.
+@st.fragment
+def chart_jobrole():
+    """Attrition rate by job role, filtered by department."""
+    st.subheader("Attrition Rate by Job Role")
+    col1, col2 = st.columns([2,1])
+    with col1:
+        # Filters
+        selected_dept = st.selectbox("Filter by Department", departments, key='dept_chart_1')
+        attrition_left = rate_by(df, data_version, "JobRole", "Department", selected_dept).sort_values(ascending=False)
+        if not attrition_left.empty:
+            fig = go.Figure(go.Bar(x=attrition_left.index.to_numpy(), y=attrition_left.to_numpy(),
+                                   marker_color="#1976D2",  # United color
+                                   marker_line_color='black', marker_line_width=1))
+            fig.update_layout(width=500, height=350, margin=dict(l=20, r=20, t=40, b=20),
+                              xaxis_title="Job Role", yaxis_title="Attrition Rate (%)",
+                              title="Attrition Rate by Job Role")
+            fig.update_xaxes(tickangle=30)
+            st.plotly_chart(fig)
+        else:
+            st.info("No data for selected filter.")
+    with col2:
+        st.markdown("**Insight:** Sales Representatives have the highest attrition rate (~40%), suggesting potential issues in role satisfaction or workload. Roles with lower attrition may have better retention practices or job satisfaction.")
+
+
+chart_jobrole()
 
 # --- NEW KPI GRAPH: Attrition by Gender ---
 st.subheader("Attrition Rate by Gender")
-gender_attrition = (
-    df.groupby("Gender")["Attrition"].mean() * 100
-)
-fig = px.bar(gender_attrition.reset_index(), x="Gender", y="Attrition", color_discrete_sequence=["#BA68C8"],
-             labels={"Attrition": "Attrition Rate (%)"}, title="Attrition Rate by Gender")
-fig.update_traces(marker_line_color='black', marker_line_width=1)
-fig.update_layout(width=500, height=350, margin=dict(l=20, r=20, t=40, b=20), plot_bgcolor='#f7f7fa', paper_bgcolor='#f7f7fa')
+gender_attrition = rate_by(df, data_version, "Gender")
+fig = go.Figure(go.Bar(x=gender_attrition.index.to_numpy(), y=gender_attrition.to_numpy(), marker_color="#BA68C8",
+                       marker_line_color='black', marker_line_width=1))
+fig.update_layout(width=500, height=350, margin=dict(l=20, r=20, t=40, b=20), plot_bgcolor='#f7f7fa', paper_bgcolor='#f7f7fa',
+                  xaxis_title="Gender", yaxis_title="Attrition Rate (%)", title="Attrition Rate by Gender")
 st.plotly_chart(fig)
 
 # 2. Attrition by Distance From Home & Job Role
-st.subheader("Attrition % by Distance From Home Range and JobRole")
-col1, col2 = st.columns([2,1])
-with col1:
-    # Filters
-    departments = ['All'] + sorted(df['Department'].dropna().unique())
-    selected_dept2 = st.selectbox("Filter by Department", departments, key='dept_chart_2')
-    filtered_df = df.copy()
-    if selected_dept2 != 'All':
-        filtered_df = filtered_df[filtered_df['Department'] == selected_dept2]
-    min_dist = filtered_df["DistanceFromHome"].min() if not filtered_df.empty else 0
-    max_dist = filtered_df["DistanceFromHome"].max() if not filtered_df.empty else 0
-    bin_edges = list(range(int(min_dist), int(max_dist) + 7, 7)) if max_dist > 0 else [0,1]
-    if bin_edges[-1] < max_dist:
-        bin_edges.append(int(max_dist) + 1)
-    range_labels = [f"{bin_edges[i]}–{bin_edges[i+1]-1}" for i in range(len(bin_edges)-1)] if len(bin_edges) > 1 else ["0-1"]
-    filtered_df["DistanceFromHomeRange"] = pd.cut(filtered_df["DistanceFromHome"], bins=bin_edges, labels=range_labels, include_lowest=True, ordered=True) if len(bin_edges) > 1 else "0-1"
-    summary = (
-        filtered_df.groupby(["DistanceFromHomeRange", "JobRole"])
-        .agg(count=("Attrition", "count"), attrition_left=("Attrition", lambda x: 100 * (x == 1).sum() / len(x)))
-        .reset_index()
-    )
-    summary = summary[summary["count"] > 7]
-    if not summary.empty:
-        fig = px.bar(summary, x="DistanceFromHomeRange", y="attrition_left", color="JobRole", barmode="group", color_discrete_sequence=px.colors.sequential.Purples)
-        fig.update_traces(marker_line_color='black', marker_line_width=1)
-        fig.update_layout(width=500, height=350, margin=dict(l=20, r=20, t=40, b=20))
-        st.plotly_chart(fig)
-    else:
-        st.info("No data for selected filter.")
-with col2:
-    st.markdown("**Insight:** Attrition increases with commute distance for some roles.")
+@st.fragment
+def chart_distance():
+    """Attrition % by commute distance and job role, filtered by department."""
+    st.subheader("Attrition % by Distance From Home Range and JobRole")
+    col1, col2 = st.columns([2,1])
+    with col1:
+        # Filters
+        selected_dept2 = st.selectbox("Filter by Department", departments, key='dept_chart_2')
+        summary = distance_jobrole_summary(df, data_version, selected_dept2)
+        if not summary.empty:
+            fig = px.bar(summary, x="DistanceFromHomeRange", y="attrition_left", color="JobRole", barmode="group", color_discrete_sequence=px.colors.sequential.Purples)
+            fig.update_traces(marker_line_color='black', marker_line_width=1)
+            fig.update_layout(width=500, height=350, margin=dict(l=20, r=20, t=40, b=20))
+            st.plotly_chart(fig)
+        else:
+            st.info("No data for selected filter.")
+    with col2:
+        st.markdown("**Insight:** Attrition increases with commute distance for some roles.")
+
+
+chart_distance()
 
 # 3. Attrition Rate by Overtime
-st.subheader("Attrition Rate by Overtime Participation")
-col1, col2 = st.columns([2,1])
-with col1:
-    overtime_opts = ['All', 'Yes', 'No']
-    selected_overtime = st.selectbox("Filter by Overtime", overtime_opts, key='overtime_chart_1')
-    filtered_df = df.copy()
-    if selected_overtime != 'All':
-        filtered_df = filtered_df[filtered_df['OverTime'] == (selected_overtime == 'Yes')]
-    overtime_labels = {True: "Did Overtime", False: "Did Not Do Overtime"}
-    filtered_df["OverTimeLabel"] = filtered_df["OverTime"].map(overtime_labels)
-    overtime_attrition = pd.crosstab(filtered_df["OverTimeLabel"], filtered_df["Attrition"], normalize='index') * 100
-    overtime_attrition = overtime_attrition.rename(columns={1: "Left", 0: "Stayed"})
-    fig = go.Figure(data=[
-        go.Bar(name='Left', x=overtime_attrition.index, y=overtime_attrition["Left"], marker_color="#6EC6FF", marker_line_color='black', marker_line_width=1),
-        go.Bar(name='Stayed', x=overtime_attrition.index, y=overtime_attrition["Stayed"], marker_color="#A5D6A7", marker_line_color='black', marker_line_width=1)
-    ])
-    fig.update_layout(barmode='stack', title="Attrition Rate by Overtime Participation", yaxis_title="% Employees", width=500, height=350, margin=dict(l=20, r=20, t=40, b=20), plot_bgcolor='#f7f7fa', paper_bgcolor='#f7f7fa')
-    st.plotly_chart(fig)
-with col2:
-    st.markdown("**Insight:** Employees who work overtime are nearly 3x more likely to leave.")
+@st.fragment
+def chart_overtime():
+    """Left/Stayed shares by overtime participation, filtered by overtime."""
+    st.subheader("Attrition Rate by Overtime Participation")
+    col1, col2 = st.columns([2,1])
+    with col1:
+        overtime_opts = ['All', 'Yes', 'No']
+        selected_overtime = st.selectbox("Filter by Overtime", overtime_opts, key='overtime_chart_1')
+        overtime_attrition = overtime_summary(df, data_version, selected_overtime)
+        fig = go.Figure(data=[
+            go.Bar(name='Left', x=overtime_attrition.index, y=overtime_attrition["Left"], marker_color="#6EC6FF", marker_line_color='black', marker_line_width=1),
+            go.Bar(name='Stayed', x=overtime_attrition.index, y=overtime_attrition["Stayed"], marker_color="#A5D6A7", marker_line_color='black', marker_line_width=1)
+        ])
+        fig.update_layout(barmode='stack', title="Attrition Rate by Overtime Participation", yaxis_title="% Employees", width=500, height=350, margin=dict(l=20, r=20, t=40, b=20), plot_bgcolor='#f7f7fa', paper_bgcolor='#f7f7fa')
+        st.plotly_chart(fig)
+    with col2:
+        st.markdown("**Insight:** Employees who work overtime are nearly 3x more likely to leave.")
+
+
+chart_overtime()
 
 # 4. Attrition by Job Level
-st.subheader("Attrition Rate by Job Level")
-col1, col2 = st.columns([2,1])
-with col1:
-    joblevels = sorted(df['JobLevel'].dropna().unique())
-    selected_level = st.selectbox("Filter by Job Level", ['All'] + [str(jl) for jl in joblevels], key='level_chart_1')
-    filtered_df = df.copy()
-    if selected_level != 'All':
-        filtered_df = filtered_df[filtered_df['JobLevel'] == int(selected_level)]
-    joblevel_attrition = (
-        filtered_df.groupby("JobLevel")["Attrition"]
-        .value_counts(normalize=True)
-        .unstack()
-        .rename(columns={0: "Stayed", 1: "Left"})
-        * 100
-    )
-    fig = go.Figure(data=[
-        go.Bar(name='Stayed', x=joblevel_attrition.index, y=joblevel_attrition["Stayed"], marker_color="#7986CB", marker_line_color='black', marker_line_width=1),
-        go.Bar(name='Left', x=joblevel_attrition.index, y=joblevel_attrition["Left"], marker_color="#BA68C8", marker_line_color='black', marker_line_width=1)
-    ])
-    fig.update_layout(barmode='stack', title="Attrition Rate by Job Level", yaxis_title="% Employees", width=500, height=350, margin=dict(l=20, r=20, t=40, b=20), plot_bgcolor='#f7f7fa', paper_bgcolor='#f7f7fa')
-    st.plotly_chart(fig)
-with col2:
-    st.markdown("**Insight:** Entry-level employees have the highest attrition rate.")
+@st.fragment
+def chart_joblevel():
+    """Left/Stayed shares by job level, filtered by job level."""
+    st.subheader("Attrition Rate by Job Level")
+    col1, col2 = st.columns([2,1])
+    with col1:
+        selected_level = st.selectbox("Filter by Job Level", joblevel_options, key='level_chart_1')
+        joblevel_attrition = joblevel_summary(df, data_version, selected_level)
+        fig = go.Figure(data=[
+            go.Bar(name='Stayed', x=joblevel_attrition.index, y=joblevel_attrition["Stayed"], marker_color="#7986CB", marker_line_color='black', marker_line_width=1),
+            go.Bar(name='Left', x=joblevel_attrition.index, y=joblevel_attrition["Left"], marker_color="#BA68C8", marker_line_color='black', marker_line_width=1)
+        ])
+        fig.update_layout(barmode='stack', title="Attrition Rate by Job Level", yaxis_title="% Employees", width=500, height=350, margin=dict(l=20, r=20, t=40, b=20), plot_bgcolor='#f7f7fa', paper_bgcolor='#f7f7fa')
+        st.plotly_chart(fig)
+    with col2:
+        st.markdown("**Insight:** Entry-level employees have the highest attrition rate.")
+
+
+chart_joblevel()
 
 # 5. Attrition by Years at Company
-st.subheader("Attrition Distribution by Years at Company")
-col1, col2 = st.columns([2,1])
-with col1:
-    bins = [0, 2, 5, 10, float('inf')]
-    tenure_labels = ["0–2 years", "2–5 years", "5–10 years", "10+ years"]
-    df["YearsAtCompanyGroup"] = pd.cut(df["YearsAtCompany"], bins=bins, labels=tenure_labels, right=False, include_lowest=True)
-    selected_tenure = st.selectbox("Filter by Tenure Group", ['All'] + tenure_labels, key='tenure_chart_1')
-    filtered_df = df.copy()
-    if selected_tenure != 'All':
-        filtered_df = filtered_df[filtered_df['YearsAtCompanyGroup'] == selected_tenure]
-    experience_attrition = (
-        filtered_df.groupby("YearsAtCompanyGroup")["Attrition"]
-        .value_counts(normalize=True)
-        .unstack()
-        .rename(columns={0: "Stayed", 1: "Left"})
-        * 100
-    )
-    fig = go.Figure(data=[
-        go.Bar(name='Stayed', x=experience_attrition.index, y=experience_attrition["Stayed"], marker_color="#4FC3F7", marker_line_color='black', marker_line_width=1),
-        go.Bar(name='Left', x=experience_attrition.index, y=experience_attrition["Left"], marker_color="#9575CD", marker_line_color='black', marker_line_width=1)
-    ])
-    fig.update_layout(barmode='stack', title="Attrition Distribution by Years at Company", yaxis_title="% Employees", width=500, height=350, margin=dict(l=20, r=20, t=40, b=20), plot_bgcolor='#f7f7fa', paper_bgcolor='#f7f7fa')
-    st.plotly_chart(fig)
-with col2:
-    st.markdown("**Insight:** Employees with 0–2 years tenure show the highest attrition rates.")
+@st.fragment
+def chart_tenure():
+    """Left/Stayed shares by tenure group, filtered by tenure group."""
+    st.subheader("Attrition Distribution by Years at Company")
+    col1, col2 = st.columns([2,1])
+    with col1:
+        selected_tenure = st.selectbox("Filter by Tenure Group", ['All'] + tenure_labels, key='tenure_chart_1')
+        experience_attrition = tenure_summary(df, data_version, selected_tenure)
+        fig = go.Figure(data=[
+            go.Bar(name='Stayed', x=experience_attrition.index, y=experience_attrition["Stayed"], marker_color="#4FC3F7", marker_line_color='black', marker_line_width=1),
+            go.Bar(name='Left', x=experience_attrition.index, y=experience_attrition["Left"], marker_color="#9575CD", marker_line_color='black', marker_line_width=1)
+        ])
+        fig.update_layout(barmode='stack', title="Attrition Distribution by Years at Company", yaxis_title="% Employees", width=500, height=350, margin=dict(l=20, r=20, t=40, b=20), plot_bgcolor='#f7f7fa', paper_bgcolor='#f7f7fa')
+        st.plotly_chart(fig)
+    with col2:
+        st.markdown("**Insight:** Employees with 0–2 years tenure show the highest attrition rates.")
+
+
+chart_tenure()
 
 # --- SUMMARY BAR CHART: Attrition Rate by Years at Company ---
 st.subheader("Attrition Rate by Years at Company (Summary)")
@@ -232,26 +344,19 @@ st.subheader("Attrition Rate by Years at Company (Summary)")
 # numeric (1 for Yes, 0 for No), the mean multiplied by 100 yields the rate as a
 # percentage.  Missing groups (e.g. if a filter above removed them) are handled by
 # reindexing against the full list of tenure labels.
-summary_rate = (
-    df.groupby("YearsAtCompanyGroup")["Attrition"].mean() * 100
-).reindex(tenure_labels)
-summary_df = summary_rate.reset_index().rename(columns={"Attrition": "AttritionRate"})
-
-fig = px.bar(
-    summary_df,
-    x="YearsAtCompanyGroup",
-    y="AttritionRate",
-    color_discrete_sequence=["orange"] * len(summary_df),
-    labels={"AttritionRate": "Attrition Rate (%)", "YearsAtCompanyGroup": "Years at Company"},
-    title="Attrition Rate by Years at Company"
-)
-fig.update_traces(
+summary_rate = rate_by(df, data_version, "YearsAtCompanyGroup").reindex(tenure_labels)
+
+fig = go.Figure(go.Bar(
+    x=summary_rate.index.to_numpy(),
+    y=summary_rate.to_numpy(),
+    marker_color="orange",
     marker_line_color='black',
     marker_line_width=1,
-    text=summary_df["AttritionRate"].apply(lambda x: f"{x:.1f}%"),
+    text=[f"{x:.1f}%" for x in summary_rate],
     textposition='outside'
-)
+))
 fig.update_layout(
+    title="Attrition Rate by Years at Company",
     width=None,
     height=350,
     margin=dict(l=20, r=20, t=40, b=20),
@@ -267,37 +372,18 @@ st.plotly_chart(fig, use_container_width=True)
 st.subheader("Attrition Rate by Job Level and Years at Company (Heatmap)")
 col1, col2 = st.columns([2,1])
 with col1:
-    # Use the pre‑computed tenure grouping.  Group by JobLevel and YearsAtCompanyGroup and
-    # calculate attrition rate on the fly.  "Attrition" is already numeric.
-    joblevel_tenure_attrition = (
-        df.groupby(["JobLevel", "YearsAtCompanyGroup"])
-        .agg(
-            Total_Employees=("EmployeeNumber", "count"),
-            Left=("Attrition", "sum")
-        )
-        .reset_index()
-    )
-    joblevel_tenure_attrition["Attrition Rate (%)"] = (
-        joblevel_tenure_attrition["Left"] / joblevel_tenure_attrition["Total_Employees"] * 100
-    )
-    pivot_table = joblevel_tenure_attrition.pivot(
-        index="JobLevel", columns="YearsAtCompanyGroup", values="Attrition Rate (%)"
-    )
-    fig, ax = plt.subplots(figsize=(5, 4))
-    sns.heatmap(
+    # Use the pre‑computed tenure grouping via the cached pivot.
+    pivot_table = joblevel_tenure_pivot(df, data_version)
+    fig = px.imshow(
         pivot_table,
-        annot=True,
-        cmap="BuGn",
-        fmt=".1f",
-        linewidths=0.5,
-        linecolor='gray',
-        cbar=True,
-        ax=ax
+        text_auto='.1f',
+        color_continuous_scale='BuGn',
+        aspect='auto',
+        labels=dict(x="Years at Company", y="Job Level", color="Attrition %"),
+        title="Attrition Rate by Job Level and Years at Company"
     )
-    ax.set_title("Attrition Rate by Job Level and Years at Company")
-    ax.set_xlabel("Years at Company")
-    ax.set_ylabel("Job Level")
-    st.pyplot(fig)
+    fig.update_layout(height=400, margin=dict(l=20, r=20, t=40, b=20))
+    st.plotly_chart(fig, use_container_width=True)
 with col2:
     st.markdown("**Insight:** Highest attrition is among entry-level employees with 0–2 years at the company.")
 